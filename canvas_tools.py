@@ -8,6 +8,9 @@ Provides a menu-driven CLI to:
   3) JSON control (backup and clear outputs)
   4) Analyze questions (duplicates, filtering)
   5) Exit
+
+Run with --watch for a headless mode that polls the input folder and
+ingests newly arrived HTML files, ZIP archives and folders automatically.
 """
 import sys
 import os
@@ -17,6 +20,7 @@ import shutil
 import subprocess
 import shlex
 import json
+import time
 from datetime import datetime
 from collections import defaultdict
 
@@ -26,8 +30,12 @@ from extractor import (
     EXTRACT_FOLDER,
     OUTPUT_JSON,
     IMAGES_FOLDER,
+    SHARD_FOLDER,
     extract_questions_from_taken_quiz,
+    extract_zip,
     write_json,
+    write_shards,
+    slugify,
 )
 
 # Paths and defaults
@@ -38,6 +46,10 @@ BACKUP_DIR = "_BACKUP"
 SERVER_HOST = "localhost"
 SERVER_PORT = 8000
 SERVER_URL = f"http://{SERVER_HOST}:{SERVER_PORT}/index.html"
+WATCH_STATE = os.path.join(os.path.dirname(OUTPUT_JSON), "ingested_inputs.json")
+WATCH_INTERVAL = 2.0
+WATCH_SETTLE = 2.0
+WATCH_MAX_RETRY = 60.0
 server_proc = None
 
 
@@ -246,11 +258,17 @@ def clear_output_folder():
             shutil.rmtree(EXTRACT_FOLDER)
         if os.path.isdir(IMAGES_FOLDER):
             shutil.rmtree(IMAGES_FOLDER)
+        if os.path.isdir(SHARD_FOLDER):
+            shutil.rmtree(SHARD_FOLDER)
         if os.path.exists(OUTPUT_JSON):
             os.remove(OUTPUT_JSON)
+        # Forget what the watcher ingested so files still in _INPUT are loaded again
+        if os.path.exists(WATCH_STATE):
+            os.remove(WATCH_STATE)
         os.makedirs(EXTRACT_FOLDER, exist_ok=True)
         os.makedirs(IMAGES_FOLDER, exist_ok=True)
-        print("\u2713 Output folder cleared and ready for new data.\n")
+        print("\u2713 Output folder cleared and ready for new data.")
+        print("  Restart any running --watch process so it re-ingests the input folder.\n")
 
 def handle_json_control():
     choice = prompt_json_menu()
@@ -308,12 +326,203 @@ def handle_question_analysis():
     # Save deduplicated JSON
     with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
         json.dump(unique_questions, f, indent=2)
+    write_shards(unique_questions, SHARD_FOLDER)
 
     print(f"\u2713 Duplicate removal complete. {len(unique_questions)} unique questions saved to {OUTPUT_JSON}")
     print(f"\u2713 Auto-backup of original data saved to {backup_path}\n")
 
 
 
+# --- Watch mode ---
+def newest_mtime(path, skip_html=False):
+    """
+    Newest mtime_ns of `path` and everything below it (0 if it is missing).
+    With `skip_html`, HTML files are ignored; they are inputs of their own.
+    """
+    try:
+        newest = os.stat(path).st_mtime_ns
+    except OSError:
+        return 0
+    for root, dirs, files in os.walk(path):
+        for name in dirs + files:
+            if skip_html and name.lower().endswith(".html"):
+                continue
+            try:
+                newest = max(newest, os.stat(os.path.join(root, name)).st_mtime_ns)
+            except OSError:
+                pass  # removed while walking
+    return newest
+
+def scan_input_dir():
+    """
+    Map every ingestible input (top-level HTML/ZIP files and HTML files inside
+    top-level folders) to a cheap [size, mtime_ns, assets_mtime_ns] stat
+    signature, keyed by its path relative to INPUT_DIR. The assets part is the
+    newest mtime of the page's "<name>_files" folder or, for HTML inside a
+    folder without one, of the folder's other contents, so a saved page only
+    settles once its images have finished copying.
+    """
+    signatures = {}
+
+    def add(entry, folder=None):
+        try:
+            st = entry.stat()
+        except OSError:
+            return  # removed between listing and stat
+        assets = os.path.splitext(entry.path)[0] + "_files"
+        if os.path.isdir(assets):
+            assets_mtime = newest_mtime(assets)
+        elif folder:
+            assets_mtime = newest_mtime(folder, skip_html=True)
+        else:
+            assets_mtime = 0
+        key = os.path.relpath(entry.path, INPUT_DIR)
+        signatures[key] = [st.st_size, st.st_mtime_ns, assets_mtime]
+
+    try:
+        entries = list(os.scandir(INPUT_DIR))
+    except FileNotFoundError:
+        return signatures
+    names = {entry.name for entry in entries}
+    for entry in entries:
+        name = entry.name.lower()
+        if entry.is_dir():
+            # Asset folder of a saved top-level page, not a folder of quizzes
+            if entry.name.endswith("_files") and entry.name[:-6] + ".html" in names:
+                continue
+            try:
+                children = list(os.scandir(entry.path))
+            except OSError:
+                continue
+            for child in children:
+                if child.is_file() and child.name.lower().endswith(".html"):
+                    add(child, entry.path)
+        elif entry.is_file() and name.endswith((".html", ".zip")):
+            add(entry)
+    return signatures
+
+def load_watch_state():
+    try:
+        with open(WATCH_STATE, "r", encoding="utf-8") as f:
+            state = json.load(f)
+            return state if isinstance(state, dict) else {}
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_watch_state(state):
+    os.makedirs(os.path.dirname(WATCH_STATE), exist_ok=True)
+    tmp_path = WATCH_STATE + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, WATCH_STATE)
+
+def parse_input(path):
+    """
+    Parse one input (HTML file or ZIP archive) into its question records.
+    Each ZIP is extracted into its own, freshly emptied subfolder of
+    EXTRACT_FOLDER so earlier archives are not parsed again.
+    """
+    if not path.lower().endswith(".zip"):
+        print(f"Parsing {path}…")
+        return extract_questions_from_taken_quiz(path, IMAGES_FOLDER)
+    name = os.path.splitext(os.path.basename(path))[0]
+    extract_to = os.path.join(EXTRACT_FOLDER, slugify(name) or "archive")
+    print(f"Extracting from {path}…")
+    if os.path.isdir(extract_to):
+        shutil.rmtree(extract_to)
+    extract_zip(path, extract_to)
+    questions = []
+    for fname in sorted(os.listdir(extract_to)):
+        if fname.lower().endswith(".html"):
+            print(f"Parsing {fname}…")
+            questions.extend(
+                extract_questions_from_taken_quiz(os.path.join(extract_to, fname), IMAGES_FOLDER)
+            )
+    return questions
+
+def ingest_inputs(paths):
+    """
+    Ingest a batch of input paths in a single JSON update and return the paths
+    that succeeded. Each record is tagged with the `input_path` (relative to
+    INPUT_DIR) it came from, and records from a re-ingested input replace the
+    ones it produced before.
+    """
+    os.makedirs(IMAGES_FOLDER, exist_ok=True)
+    all_questions = []
+    ingested = []
+    for path in paths:
+        try:
+            questions = parse_input(path)
+            input_path = os.path.relpath(path, INPUT_DIR)
+            for q in questions:
+                q["input_path"] = input_path
+            all_questions.extend(questions)
+            ingested.append(path)
+        except Exception as e:
+            print(f"\u2717 Failed to ingest {path}: {e}")
+    if all_questions:
+        try:
+            write_json(
+                all_questions, OUTPUT_JSON,
+                replace_inputs={os.path.relpath(p, INPUT_DIR) for p in ingested},
+            )
+        except OSError as e:
+            print(f"\u2717 Failed to write {OUTPUT_JSON}: {e}")
+            return []
+        print(f"\u2713 Processed {len(all_questions)} questions to {OUTPUT_JSON}")
+    return ingested
+
+def watch_input(interval=WATCH_INTERVAL, settle=WATCH_SETTLE):
+    """
+    Poll INPUT_DIR every `interval` seconds and ingest inputs that are new or
+    changed since they were last ingested. An input is only picked up once its
+    signature is unchanged across two polls and it and its assets are at least
+    `settle` seconds old, so exports that are still being copied are skipped.
+    Ingested signatures are persisted in WATCH_STATE; inputs that fail stay
+    pending and are retried with a backoff of up to WATCH_MAX_RETRY seconds.
+    The state is loaded once at start, so restart the watcher after clearing
+    the output folder.
+    """
+    state = load_watch_state()
+    pending = {}
+    failures = {}  # key -> (signature, attempts, retry_at)
+    print(f"Watching '{INPUT_DIR}' for new quiz exports every {interval:g}s (Ctrl+C to stop)…")
+    try:
+        while True:
+            current = scan_input_dir()
+            now_ns = time.time_ns()
+            now = time.monotonic()
+            ready = [
+                key
+                for key, sig in current.items()
+                if state.get(key) != sig
+                and pending.get(key) == sig
+                and now_ns - max(sig[1], sig[2]) >= settle * 1e9
+                and not (key in failures and failures[key][0] == sig and now < failures[key][2])
+            ]
+            pending = {key: sig for key, sig in current.items() if state.get(key) != sig}
+            if ready:
+                ready.sort()
+                print(f"\n[{datetime.now():%H:%M:%S}] Ingesting {len(ready)} new input(s)…")
+                ingested = ingest_inputs([os.path.join(INPUT_DIR, key) for key in ready])
+                ingested = {os.path.relpath(path, INPUT_DIR) for path in ingested}
+                for key in ready:
+                    if key in ingested:
+                        state[key] = current[key]
+                        failures.pop(key, None)
+                    else:
+                        prev = failures.get(key)
+                        attempts = prev[1] + 1 if prev and prev[0] == current[key] else 1
+                        delay = min(interval * 2 ** attempts, WATCH_MAX_RETRY)
+                        failures[key] = (current[key], attempts, now + delay)
+                        print(f"  will retry {key} in {delay:g}s")
+                if ingested:
+                    save_watch_state(state)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\nWatch stopped.")
+
+
 # --- Main menu and dispatch ---
 def main_menu():
     while True:
@@ -341,9 +550,28 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Canvas quiz extractor and server menu")
     parser.add_argument("--extract", action="store_true", help="Process HTML files immediately")
     parser.add_argument("--serve", action="store_true", help="Start quiz webserver immediately")
+    parser.add_argument(
+        "--watch", action="store_true",
+        help=f"Run headless, ingesting new files from '{INPUT_DIR}' as they arrive"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=WATCH_INTERVAL,
+        help=f"Watch poll interval in seconds (default: {WATCH_INTERVAL:g})"
+    )
+    parser.add_argument(
+        "--settle", type=float, default=WATCH_SETTLE,
+        help=f"Seconds a file must stay unchanged before it is ingested (default: {WATCH_SETTLE:g})"
+    )
     args = parser.parse_args()
 
-    if args.extract:
+    if args.watch:
+        if args.serve:
+            handle_toggle_server()
+        watch_input(args.interval, args.settle)
+        if server_proc and server_proc.poll() is None:
+            server_proc.terminate()
+            server_proc.wait()
+    elif args.extract:
         handle_process_html()
         main_menu()
     elif args.serve:
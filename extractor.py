@@ -5,12 +5,15 @@ extractor.py
 Provides functions to extract quiz questions from Canvas HTML files,
 copy images, slugify names, and write output JSON. Now includes
 `extract_main` for programmatic integration with canvas_tools.
+The library is also written as per-class/per-quiz shards with a
+manifest so the web UI only loads what the current filters select.
 """
 import zipfile
 import os
 import re
 import json
 import shutil
+import hashlib
 from bs4 import BeautifulSoup, Tag, NavigableString
 
 # —— CONFIG —————————————————————————————————————————————————————————————
@@ -18,6 +21,8 @@ ZIP_FILE        = '_INPUT/Quizes.zip'
 EXTRACT_FOLDER  = '_OUTPUT/extracted_quizzes'
 OUTPUT_JSON     = '_OUTPUT/extracted_questions_full.json'
 IMAGES_FOLDER   = '_OUTPUT/_images'
+SHARD_FOLDER    = '_OUTPUT/shards'
+SHARD_MANIFEST  = 'manifest.json'
 
 # —— UNZIP UTILITY —————————————————————————————————————————————————————
 def extract_zip(zip_path: str, extract_to: str):
@@ -257,9 +262,18 @@ def extract_questions_from_taken_quiz(
     return questions
 
 # —— WRITE JSON ————————————————————————————————————————————————————————
-def write_json(data: list, out_path: str):
+def write_json(
+    data: list,
+    out_path: str,
+    replace_inputs=(),
+    shard_folder: str = None
+):
     """
     Append new entries to an existing JSON array, or create it if missing/invalid.
+    Existing entries whose `input_path` is in `replace_inputs` are dropped
+    first, so re-ingesting an input replaces its earlier records.
+    The combined library is re-sharded into `shard_folder`, which defaults to
+    a `shards` folder next to `out_path`.
     """
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
     # Load existing entries, if any
@@ -270,10 +284,67 @@ def write_json(data: list, out_path: str):
                 existing = []
     except (FileNotFoundError, json.JSONDecodeError):
         existing = []
+    if replace_inputs:
+        existing = [e for e in existing if e.get('input_path') not in replace_inputs]
     # Combine and write back
     combined = existing + data
     with open(out_path, 'w', encoding='utf-8') as f:
         json.dump(combined, f, indent=2, ensure_ascii=False)
+    write_shards(combined, shard_folder or os.path.join(os.path.dirname(out_path), 'shards'))
+
+# —— WRITE SHARDS ——————————————————————————————————————————————————————
+def write_shards(data: list, shard_folder: str = SHARD_FOLDER) -> dict:
+    """
+    Partition the full library by (class, quiz_name) into content-addressed
+    shard files plus a manifest listing each shard's file, hash, record count
+    and facet values. Unchanged shards keep their file name, so clients can
+    cache them forever; shards no longer referenced are removed.
+    """
+    os.makedirs(shard_folder, exist_ok=True)
+    groups = {}
+    for entry in data:
+        groups.setdefault((entry.get('class'), entry.get('quiz_name')), []).append(entry)
+
+    shards = []
+    for (class_code, quiz_name), entries in groups.items():
+        payload = json.dumps(entries, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        digest = hashlib.sha256(payload).hexdigest()[:16]
+        stem = f"{slugify(class_code or '') or 'unknown'}__{slugify(quiz_name or '') or 'unknown'}"
+        file_name = f"{stem}.{digest}.json"
+        path = os.path.join(shard_folder, file_name)
+        # Write via a temp file so a crash never leaves a truncated shard
+        # under its immutable name.
+        if not os.path.exists(path) or os.path.getsize(path) != len(payload):
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        users = sorted({(e.get('first_name'), e.get('last_name')) for e in entries},
+                       key=lambda u: (u[0] or '', u[1] or ''))
+        shards.append({
+            'class':            class_code,
+            'quiz_name':        quiz_name,
+            'file':             file_name,
+            'hash':             digest,
+            'count':            len(entries),
+            'question_numbers': sorted({e.get('question_number') for e in entries
+                                        if e.get('question_number') is not None}),
+            'users':            [list(u) for u in users],
+            'statuses':         sorted({e.get('status') for e in entries if e.get('status')}),
+        })
+
+    manifest = {'version': 1, 'total': len(data), 'shards': shards}
+    manifest_path = os.path.join(shard_folder, SHARD_MANIFEST)
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, manifest_path)
+
+    live = {s['file'] for s in shards} | {SHARD_MANIFEST}
+    for fname in os.listdir(shard_folder):
+        if fname.endswith(('.json', '.tmp')) and fname not in live:
+            os.remove(os.path.join(shard_folder, fname))
+    return manifest
 
 def OLD_write_json(data: list, out_path: str):
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+load_test.py
+
+Load-testing harness for the quiz review server (web_serve.py).
+Builds a synthetic question library and image set in a temporary folder,
+starts the server on a free local port, then replays page loads
+(index.html, styles.css, script.js, the shard manifest and shards -- or
+the monolithic library JSON with --mode monolithic -- and a sample of
+images) from concurrent simulated reviewers. Reports throughput and
+p50/p95/p99 latency per asset type. Uses only the standard library
+besides the project's own extractor module.
+"""
+import os
+import sys
+import math
+import json
+import time
+import random
+import shutil
+import socket
+import argparse
+import tempfile
+import subprocess
+import http.client
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from extractor import write_shards, SHARD_MANIFEST
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SERVE_SCRIPT = os.path.join(SCRIPT_DIR, "web_serve.py")
+STATIC_FILES = ["index.html", "styles.css", "script.js"]
+LIBRARY_PATH = "/_OUTPUT/extracted_questions_full.json"
+IMAGES_PATH = "/_OUTPUT/_images"
+SHARDS_PATH = "/_OUTPUT/shards"
+ASSET_TYPES = ["html", "css", "js", "json", "manifest", "shard", "image"]
+
+# Minimal PNG signature; the rest of each synthetic image is random padding.
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+# —— SYNTHETIC DATA —————————————————————————————————————————————————————
+def build_site(root: str, questions: int, images: int, image_kb: int, seed: int):
+    """
+    Populate `root` with the UI files, a synthetic library of `questions`
+    entries (monolithic JSON plus shards) and `images` image files.
+    Returns (image file names, shard file names).
+    """
+    rng = random.Random(seed)
+    for name in STATIC_FILES:
+        shutil.copy(os.path.join(SCRIPT_DIR, name), os.path.join(root, name))
+    images_dir = os.path.join(root, IMAGES_PATH.lstrip("/"))
+    os.makedirs(images_dir, exist_ok=True)
+
+    image_names = []
+    for i in range(images):
+        name = f"synthetic-quiz_att1_q{i + 1:04d}_img01.png"
+        with open(os.path.join(images_dir, name), "wb") as f:
+            f.write(PNG_HEADER + rng.randbytes(max(image_kb * 1024 - len(PNG_HEADER), 0)))
+        image_names.append(name)
+
+    statuses = ["correct", "incorrect", "partial"]
+    library = []
+    for i in range(questions):
+        quiz_no = i // 20 + 1
+        body = [{"type": "text", "text": f"Synthetic question {i + 1}: " + "lorem ipsum " * 20}]
+        if i < len(image_names):
+            body.append({"type": "image", "src": image_names[i]})
+        options = [f"Option {c} for question {i + 1}" for c in "ABCD"]
+        library.append({
+            "first_name":       "Load",
+            "last_name":        f"Tester{i % 5}",
+            "class_name":       "Synthetic Class",
+            "class":            f"CS_{100 + quiz_no % 3}",
+            "section":          "001",
+            "term":             "Fall",
+            "year":             "2025",
+            "quiz_name":        f"Quiz {quiz_no}",
+            "attempt":          1,
+            "question_id":      f"quiz-{quiz_no}_att1_q{i % 20 + 1:02d}",
+            "question_number":  i % 20 + 1,
+            "status":           rng.choice(statuses),
+            "points_awarded":   1.0,
+            "points_possible":  1.0,
+            "question_body":    body,
+            "options":          options,
+            "selected_options": [rng.choice(options)],
+            "source_file":      f"quiz-{quiz_no}.html",
+        })
+    with open(os.path.join(root, LIBRARY_PATH.lstrip("/")), "w", encoding="utf-8") as f:
+        json.dump(library, f, indent=2, ensure_ascii=False)
+    manifest = write_shards(library, os.path.join(root, SHARDS_PATH.lstrip("/")))
+    return image_names, [s["file"] for s in manifest["shards"]]
+
+
+# —— SERVER PROCESS ——————————————————————————————————————————————————————
+def free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("localhost", 0))
+        return s.getsockname()[1]
+
+def start_server(directory: str, port: int, timeout: float = 10.0) -> subprocess.Popen:
+    """
+    Launch web_serve.py as a subprocess and wait until it accepts connections.
+    """
+    proc = subprocess.Popen(
+        [sys.executable, SERVE_SCRIPT, "--directory", directory,
+         "--port", str(port), "--no-open"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited early with code {proc.returncode}")
+        try:
+            with socket.create_connection(("localhost", port), timeout=0.5):
+                return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.terminate()
+    proc.wait()
+    raise RuntimeError(f"Server did not start on port {port} within {timeout:g}s")
+
+
+# —— LOAD GENERATION —————————————————————————————————————————————————————
+def page_requests(
+    image_names: list,
+    shard_files: list,
+    images_per_page: int,
+    shards_per_page: int,
+    mode: str,
+    rng: random.Random
+) -> list:
+    """
+    The (asset_type, path) sequence a browser issues for one page load.
+    In sharded mode that is the manifest plus `shards_per_page` shards
+    (0 = all, as with every filter selected); otherwise the library JSON.
+    """
+    reqs = [
+        ("html", "/index.html"),
+        ("css", "/styles.css"),
+        ("js", "/script.js"),
+    ]
+    if mode == "monolithic":
+        reqs.append(("json", LIBRARY_PATH))
+    else:
+        reqs.append(("manifest", f"{SHARDS_PATH}/{SHARD_MANIFEST}"))
+        count = shards_per_page or len(shard_files)
+        reqs.extend(("shard", f"{SHARDS_PATH}/{name}")
+                    for name in rng.sample(shard_files, min(count, len(shard_files))))
+    sample = rng.sample(image_names, min(images_per_page, len(image_names)))
+    reqs.extend(("image", f"{IMAGES_PATH}/{name}") for name in sample)
+    return reqs
+
+def fetch(host: str, port: int, path: str, timeout: float):
+    """
+    GET `path` on a fresh connection. Returns (latency_s, bytes, ok).
+    """
+    start = time.perf_counter()
+    conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        conn.request("GET", path)
+        resp = conn.getresponse()
+        size = len(resp.read())
+        ok = resp.status == 200
+    except (OSError, http.client.HTTPException):
+        size, ok = 0, False
+    finally:
+        conn.close()
+    return time.perf_counter() - start, size, ok
+
+def run_load(host, port, make_page, concurrency, duration, pages, timeout, seed):
+    """
+    Run `concurrency` simulated reviewers issuing page loads back to back until
+    `duration` seconds have passed or `pages` page loads have been started.
+    `make_page(rng)` returns the (asset_type, path) requests of one page load.
+    Returns (samples, elapsed_s, pages_done); samples maps asset type to a list
+    of (latency_s, bytes, ok).
+    """
+    samples = defaultdict(list)
+    lock = threading.Lock()
+    counter = {"pages": 0}
+    deadline = time.monotonic() + duration if duration else None
+
+    def next_page():
+        with lock:
+            if pages and counter["pages"] >= pages:
+                return False
+            if deadline and time.monotonic() >= deadline:
+                return False
+            counter["pages"] += 1
+            return True
+
+    def reviewer(worker_id):
+        rng = random.Random(seed + worker_id)
+        local = defaultdict(list)
+        while next_page():
+            for asset, path in make_page(rng):
+                local[asset].append(fetch(host, port, path, timeout))
+        with lock:
+            for asset, results in local.items():
+                samples[asset].extend(results)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(reviewer, i) for i in range(concurrency)]:
+            future.result()
+    return samples, time.perf_counter() - start, counter["pages"]
+
+
+# —— REPORTING ———————————————————————————————————————————————————————————
+def percentile(sorted_values: list, pct: float) -> float:
+    """
+    Nearest-rank percentile of an already sorted list.
+    """
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+def summarize(samples: dict, elapsed: float) -> dict:
+    summary = {}
+    rows = [(asset, samples.get(asset, [])) for asset in ASSET_TYPES]
+    rows.append(("total", [s for asset in ASSET_TYPES for s in samples.get(asset, [])]))
+    for asset, results in rows:
+        if not results:
+            continue
+        latencies = sorted(r[0] for r in results)
+        total_bytes = sum(r[1] for r in results)
+        summary[asset] = {
+            "requests":   len(results),
+            "errors":     sum(1 for r in results if not r[2]),
+            "req_per_s":  len(results) / elapsed if elapsed else 0.0,
+            "mb_per_s":   total_bytes / elapsed / 1e6 if elapsed else 0.0,
+            "p50_ms":     percentile(latencies, 50) * 1000,
+            "p95_ms":     percentile(latencies, 95) * 1000,
+            "p99_ms":     percentile(latencies, 99) * 1000,
+            "max_ms":     latencies[-1] * 1000,
+        }
+    return summary
+
+def print_report(summary: dict, elapsed: float, pages_done: int, concurrency: int):
+    print(f"\n{pages_done} page loads by {concurrency} reviewers in {elapsed:.2f}s "
+          f"({pages_done / elapsed if elapsed else 0:.2f} pages/s)\n")
+    header = f"{'asset':<9}{'reqs':>8}{'errors':>8}{'req/s':>10}{'MB/s':>9}" \
+             f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for asset, s in summary.items():
+        print(f"{asset:<9}{s['requests']:>8}{s['errors']:>8}{s['req_per_s']:>10.1f}"
+              f"{s['mb_per_s']:>9.2f}{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}"
+              f"{s['p99_ms']:>10.1f}{s['max_ms']:>10.1f}")
+    print()
+
+
+# —— CLI ENTRYPOINT —————————————————————————————————————————————————————
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load-test web_serve.py with synthetic quiz review page loads"
+    )
+    parser.add_argument("-c", "--concurrency", type=int, default=8,
+                        help="Number of simultaneous reviewers (default: 8)")
+    parser.add_argument("-d", "--duration", type=float, default=10.0,
+                        help="Seconds to generate load; 0 to rely on --pages (default: 10)")
+    parser.add_argument("-n", "--pages", type=int, default=0,
+                        help="Stop after this many page loads; 0 for no limit (default: 0)")
+    parser.add_argument("--questions", type=int, default=1000,
+                        help="Questions in the synthetic library (default: 1000)")
+    parser.add_argument("--images", type=int, default=200,
+                        help="Images in the synthetic library (default: 200)")
+    parser.add_argument("--images-per-page", type=int, default=40,
+                        help="Images fetched per page load (default: 40)")
+    parser.add_argument("--mode", choices=["sharded", "monolithic"], default="sharded",
+                        help="Load the library as manifest + shards or as one JSON (default: sharded)")
+    parser.add_argument("--shards-per-page", type=int, default=0,
+                        help="Shards fetched per page load in sharded mode; 0 for all (default: 0)")
+    parser.add_argument("--image-kb", type=int, default=50,
+                        help="Size of each synthetic image in KB (default: 50)")
+    parser.add_argument("--port", type=int, default=0,
+                        help="Port for the server under test (default: a free port)")
+    parser.add_argument("--timeout", type=float, default=30.0,
+                        help="Per-request timeout in seconds (default: 30)")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Random seed for data and request mixes (default: 0)")
+    parser.add_argument("--json", metavar="PATH",
+                        help="Also write the results as JSON to PATH for run-to-run comparison")
+    args = parser.parse_args()
+    if not args.duration and not args.pages:
+        parser.error("one of --duration or --pages must be non-zero")
+
+    port = args.port or free_port()
+    with tempfile.TemporaryDirectory(prefix="quiz_load_") as site:
+        print(f"Building synthetic library ({args.questions} questions, "
+              f"{args.images} x {args.image_kb} KB images)…")
+        image_names, shard_files = build_site(
+            site, args.questions, args.images, args.image_kb, args.seed
+        )
+        print(f"Starting server on port {port}…")
+        server = start_server(site, port)
+        try:
+            print(f"Running load: {args.concurrency} reviewers, {args.mode} library, "
+                  f"{args.images_per_page} images per page…")
+            make_page = lambda rng: page_requests(
+                image_names, shard_files, args.images_per_page,
+                args.shards_per_page, args.mode, rng,
+            )
+            samples, elapsed, pages_done = run_load(
+                "localhost", port, make_page, args.concurrency,
+                args.duration, args.pages, args.timeout, args.seed,
+            )
+        finally:
+            server.terminate()
+            server.wait()
+
+    summary = summarize(samples, elapsed)
+    print_report(summary, elapsed, pages_done, args.concurrency)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "config": vars(args),
+                "elapsed_s": elapsed,
+                "pages": pages_done,
+                "assets": summary,
+            }, f, indent=2)
+        print(f"✓ Results written to {args.json}")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,11 @@
 // script.js
+const SHARD_ROOT = '/_OUTPUT/shards/';
+const FULL_JSON = '/_OUTPUT/extracted_questions_full.json';
+
 let allQuestions = [];
+let manifest = null;
+let renderToken = 0;
+const shardCache = new Map();
 
 const getEl = id => document.getElementById(id);
 const toggleBtn = getEl('filter-toggle');
@@ -37,34 +43,80 @@ function setupClearFilters() {
   });
 }
 
-function initFilters(data) {
-  const setFilter = (id, values) => {
-    const sel = getEl(id);
-    sel.innerHTML = '';
-    values.forEach(v => sel.append(new Option(v, v)));
-    Array.from(sel.options).forEach(opt => opt.selected = true);
-  };
-
-  setFilter('filter-question', [...new Set(data.map(q => q.question_number))].sort((a, b) => a - b));
-  setFilter('filter-class', [...new Set(data.map(q => q.class))]);
-  setFilter('filter-user', [...new Set(data.map(q => `${q.first_name} ${q.last_name}`))]);
-  Array.from(getEl('filter-status').options).forEach(opt => opt.selected = true);
-
-  getEl('filter-class').addEventListener('change', () => updateQuizFilter(data));
-  updateQuizFilter(data);
+// Build an in-memory manifest when only the monolithic JSON is available,
+// pre-filling the shard cache so both modes share the same code path.
+function buildManifest(data) {
+  const groups = new Map();
+  data.forEach(q => {
+    const key = JSON.stringify([q.class, q.quiz_name]);
+    if (!groups.has(key)) groups.set(key, []);
+    groups.get(key).push(q);
+  });
+  const shards = [...groups.entries()].map(([key, entries]) => {
+    shardCache.set(key, Promise.resolve(entries));
+    return {
+      class: entries[0].class,
+      quiz_name: entries[0].quiz_name,
+      file: key,
+      count: entries.length,
+      question_numbers: [...new Set(entries.map(q => q.question_number))],
+      users: entries.map(q => [q.first_name, q.last_name])
+    };
+  });
+  return { total: data.length, shards };
+}
+
+function loadManifest() {
+  return fetch(SHARD_ROOT + 'manifest.json', { cache: 'no-cache' })
+    .then(r => r.ok ? r.json() : fetch(FULL_JSON).then(r => r.json()).then(buildManifest));
+}
+
+// Shard files are content-addressed, so each one is fetched at most once.
+function loadShard(shard) {
+  if (!shardCache.has(shard.file)) {
+    const p = fetch(SHARD_ROOT + shard.file).then(r => {
+      if (!r.ok) throw Object.assign(new Error(`${r.status} ${shard.file}`), { status: r.status });
+      return r.json();
+    });
+    p.catch(() => shardCache.delete(shard.file));
+    shardCache.set(shard.file, p);
+  }
+  return shardCache.get(shard.file);
 }
 
-function updateQuizFilter(data) {
+// Replace a select's options. With `keep`, previously deselected values stay
+// deselected; everything else (including new values) is selected.
+function setFilter(id, values, keep = false) {
+  const sel = getEl(id);
+  const known = new Set(Array.from(sel.options).map(o => o.value));
+  const chosen = new Set(Array.from(sel.selectedOptions).map(o => o.value));
+  sel.innerHTML = '';
+  values.forEach(v => sel.append(new Option(v, v)));
+  Array.from(sel.options).forEach(opt => opt.selected = !keep || !known.has(opt.value) || chosen.has(opt.value));
+}
+
+function initFilters(keep = false) {
+  const shards = manifest.shards;
+  setFilter('filter-question', [...new Set(shards.flatMap(s => s.question_numbers))].sort((a, b) => a - b), keep);
+  setFilter('filter-class', [...new Set(shards.map(s => s.class))], keep);
+  setFilter('filter-user', [...new Set(shards.flatMap(s => s.users.map(([f, l]) => `${f} ${l}`)))], keep);
+  if (!keep) Array.from(getEl('filter-status').options).forEach(opt => opt.selected = true);
+  populateQuizFilter(keep);
+}
+
+function populateQuizFilter(keep = false) {
   const selectedClasses = Array.from(getEl('filter-class').selectedOptions).map(o => o.value);
-  const quizzes = [...new Set(data.filter(q => selectedClasses.includes(q.class)).map(q => q.quiz_name))];
-  const quizSelect = getEl('filter-quiz');
-  quizSelect.innerHTML = '';
-  quizzes.forEach(q => quizSelect.append(new Option(q, q)));
-  Array.from(quizSelect.options).forEach(opt => opt.selected = true);
+  const quizzes = [...new Set(manifest.shards.filter(s => selectedClasses.includes(s.class)).map(s => s.quiz_name))];
+  setFilter('filter-quiz', quizzes, keep);
+}
+
+function updateQuizFilter() {
+  populateQuizFilter();
   applyFilters();
 }
 
-function applyFilters() {
+async function applyFilters(retried = false) {
+  const token = ++renderToken;
   const getSelected = id => Array.from(getEl(id).selectedOptions).map(o => o.value);
   const query = getEl('filter-search').value.toLowerCase().trim();
   const questions = getSelected('filter-question').map(Number);
@@ -74,6 +126,31 @@ function applyFilters() {
   const statuses = getSelected('filter-status').map(s => s.toLowerCase());
   const selectedOnly = getEl('filter-selected-only').checked;
 
+  // Only fetch the shards for the selected classes and quizzes.
+  const shards = manifest.shards.filter(s => classes.includes(s.class) && quizzes.includes(s.quiz_name));
+  let loaded;
+  try {
+    loaded = await Promise.all(shards.map(loadShard));
+  } catch (e) {
+    if (token !== renderToken) return;
+    // A newer ingest replaced the shard: reload the manifest once and retry.
+    if (e.status === 404 && retried !== true) {
+      try {
+        manifest = await loadManifest();
+      } catch (err) {
+        if (token === renderToken) getEl('quiz-container').textContent = '❌ Failed to load JSON: ' + err;
+        return;
+      }
+      if (token !== renderToken) return;
+      initFilters(true);
+      return applyFilters(true);
+    }
+    getEl('quiz-container').textContent = '❌ Failed to load JSON: ' + e;
+    return;
+  }
+  if (token !== renderToken) return;
+  allQuestions = loaded.flat();
+
   const results = allQuestions.filter(q => {
     if (query && !([...q.question_body.filter(p => p.type === 'text').map(p => p.text), ...q.options].join(' ').toLowerCase().includes(query))) return false;
     if (!questions.includes(q.question_number)) return false;
@@ -100,7 +177,7 @@ function applyFilters() {
 function renderQuestions(questions, selOnly) {
   const container = getEl('quiz-container');
   container.innerHTML = '';
-  getEl('result-count').textContent = `Showing ${questions.length} of ${allQuestions.length} questions`;
+  getEl('result-count').textContent = `Showing ${questions.length} of ${manifest.total} questions`;
   if (!questions.length) return container.textContent = 'No questions match the selected filters.';
 
   questions.forEach(q => {
@@ -127,13 +204,13 @@ function renderQuestions(questions, selOnly) {
 
 getEl('toggle-theme').addEventListener('click', () => document.body.classList.toggle('dark'));
 
-fetch('/_OUTPUT/extracted_questions_full.json')
-  .then(r => r.json())
-  .then(data => {
-    allQuestions = data;
-    initFilters(data);
+loadManifest()
+  .then(m => {
+    manifest = m;
+    initFilters();
     setupFilterToggle();
     setupClearFilters();
+    getEl('filter-class').addEventListener('change', updateQuizFilter);
     [
       'filter-search', 'filter-question', 'filter-quiz', 'filter-class',
       'filter-user', 'filter-status', 'filter-selected-only'
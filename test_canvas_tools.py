@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+test_canvas_tools.py
+
+Tests for the headless watch-mode ingest in canvas_tools.
+Run with: python -m unittest test_canvas_tools
+"""
+import os
+import json
+import zipfile
+import tempfile
+import unittest
+from unittest import mock
+
+import canvas_tools
+
+QUIZ_HTML = """<html><body>
+<div class="ic-app-crumbs"><nav id="breadcrumbs"><ul>
+  <li><span class="ellipsible">Home</span></li>
+  <li><span class="ellipsible">Intro to Computing ({course})</span></li>
+</ul></nav></div>
+<header class="quiz-header"><h2>{quiz} Results for Ada Lovelace</h2></header>
+<ul><li class="quiz_version selected"><a>Attempt 1</a></li></ul>
+<div class="display_question">
+  <span class="points question_points">1 pts</span>
+  <div class="user_points">1</div>
+  <div class="question_text">What is 1 + 1?</div>
+  <div class="answer selected_answer"><div class="answer_text">2</div></div>
+  <div class="answer"><div class="answer_text">3</div></div>
+</div>
+</body></html>
+"""
+
+
+class WatchTestCase(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+        os.makedirs(canvas_tools.INPUT_DIR)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    def write_input(self, name, quiz, course="CS_101_001_F25"):
+        path = os.path.join(canvas_tools.INPUT_DIR, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(QUIZ_HTML.format(quiz=quiz, course=course))
+        return path
+
+    def load_library(self):
+        with open(canvas_tools.OUTPUT_JSON, encoding="utf-8") as f:
+            return json.load(f)
+
+
+class IngestInputsTest(WatchTestCase):
+    def test_reingesting_changed_input_replaces_its_records(self):
+        a = self.write_input("a.html", "Quiz 1")
+        b = self.write_input("b.html", "Quiz 2")
+        self.assertEqual(canvas_tools.ingest_inputs([a, b]), [a, b])
+
+        # Same export copied again (new mtime), then ingested on its own.
+        self.write_input("a.html", "Quiz 1")
+        self.assertEqual(canvas_tools.ingest_inputs([a]), [a])
+
+        library = self.load_library()
+        self.assertEqual(sorted(q["quiz_name"] for q in library), ["Quiz 1", "Quiz 2"])
+
+    def test_same_quiz_name_in_two_classes_is_kept_apart(self):
+        cs101 = self.write_input("cs101.html", "Quiz 1", course="CS_101_001_F25")
+        cs201 = self.write_input("cs201.html", "Quiz 1", course="CS_201_001_F25")
+        canvas_tools.ingest_inputs([cs101])
+        canvas_tools.ingest_inputs([cs201])
+        self.write_input("cs101.html", "Quiz 1", course="CS_101_001_F25")
+        canvas_tools.ingest_inputs([cs101])
+
+        classes = sorted(q["class"] for q in self.load_library())
+        self.assertEqual(classes, ["CS_101", "CS_201"])
+
+    def test_reingesting_updated_zip_replaces_its_records(self):
+        html = self.write_input("inner.html", "Quiz 3")
+        zip_path = os.path.join(canvas_tools.INPUT_DIR, "export.zip")
+        for _ in range(2):
+            with zipfile.ZipFile(zip_path, "w") as zf:
+                zf.write(html, arcname="inner.html")
+            self.assertEqual(canvas_tools.ingest_inputs([zip_path]), [zip_path])
+        self.assertEqual(len(self.load_library()), 1)
+
+    def test_failed_input_is_not_reported_as_ingested(self):
+        a = self.write_input("a.html", "Quiz 1")
+        bad_zip = os.path.join(canvas_tools.INPUT_DIR, "partial.zip")
+        with open(bad_zip, "wb") as f:
+            f.write(b"PK\x03\x04 truncated")
+        self.assertEqual(canvas_tools.ingest_inputs([a, bad_zip]), [a])
+        self.assertEqual(len(self.load_library()), 1)
+
+
+class ScanInputDirTest(WatchTestCase):
+    def test_page_assets_are_part_of_the_signature(self):
+        self.write_input("a.html", "Quiz 1")
+        assets = os.path.join(canvas_tools.INPUT_DIR, "a_files")
+        os.makedirs(assets)
+        before = canvas_tools.scan_input_dir()
+        self.assertEqual(list(before), ["a.html"])  # a_files is not a quiz folder
+
+        image = os.path.join(assets, "img.png")
+        with open(image, "wb") as f:
+            f.write(b"png")
+        os.utime(image, ns=(before["a.html"][2] + 10**9,) * 2)
+        self.assertNotEqual(canvas_tools.scan_input_dir()["a.html"], before["a.html"])
+
+    def test_folder_contents_are_part_of_the_signature(self):
+        self.write_input(os.path.join("batch", "q.html"), "Quiz 1")
+        before = canvas_tools.scan_input_dir()
+        image = os.path.join(canvas_tools.INPUT_DIR, "batch", "img.png")
+        with open(image, "wb") as f:
+            f.write(b"png")
+        os.utime(image, ns=(before[os.path.join("batch", "q.html")][2] + 10**9,) * 2)
+        after = canvas_tools.scan_input_dir()
+        self.assertNotEqual(after[os.path.join("batch", "q.html")],
+                            before[os.path.join("batch", "q.html")])
+
+
+class ClearOutputFolderTest(WatchTestCase):
+    def test_clear_forgets_watch_state(self):
+        canvas_tools.save_watch_state({"a.html": [1, 2, 0]})
+        with mock.patch("builtins.input", return_value="YES"):
+            canvas_tools.clear_output_folder()
+        self.assertFalse(os.path.exists(canvas_tools.WATCH_STATE))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+test_extractor.py
+
+Tests for the sharded library output written by extractor.write_shards.
+Run with: python -m unittest test_extractor
+"""
+import os
+import json
+import tempfile
+import unittest
+
+from extractor import write_shards, SHARD_MANIFEST
+
+
+def record(class_code, quiz, number, first="Ada", last="Lovelace", status="correct"):
+    return {
+        'first_name':      first,
+        'last_name':       last,
+        'class':           class_code,
+        'quiz_name':       quiz,
+        'question_number': number,
+        'status':          status,
+    }
+
+
+class WriteShardsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.folder = os.path.join(self.tmp.name, 'shards')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def shards_by_quiz(self, manifest):
+        return {(s['class'], s['quiz_name']): s for s in manifest['shards']}
+
+    def shard_files(self):
+        return sorted(f for f in os.listdir(self.folder) if f != SHARD_MANIFEST)
+
+    def test_unchanged_shard_keeps_name_and_hash(self):
+        quiz1 = [record('CS_101', 'Quiz 1', 1), record('CS_101', 'Quiz 1', 2)]
+        first = self.shards_by_quiz(write_shards(quiz1, self.folder))
+        second = self.shards_by_quiz(
+            write_shards(quiz1 + [record('CS_101', 'Quiz 2', 1)], self.folder)
+        )
+        key = ('CS_101', 'Quiz 1')
+        self.assertEqual(second[key]['file'], first[key]['file'])
+        self.assertEqual(second[key]['hash'], first[key]['hash'])
+        self.assertEqual(len(self.shard_files()), 2)
+
+    def test_changed_shard_gets_new_name_and_stale_file_is_removed(self):
+        key = ('CS_101', 'Quiz 1')
+        old = self.shards_by_quiz(write_shards([record(*key, 1)], self.folder))[key]
+        new = self.shards_by_quiz(
+            write_shards([record(*key, 1), record(*key, 2)], self.folder)
+        )[key]
+        self.assertNotEqual(new['file'], old['file'])
+        self.assertNotEqual(new['hash'], old['hash'])
+        self.assertEqual(self.shard_files(), [new['file']])
+        with open(os.path.join(self.folder, new['file']), encoding='utf-8') as f:
+            self.assertEqual(len(json.load(f)), 2)
+
+    def test_manifest_facets_match_records(self):
+        data = [
+            record('CS_101', 'Quiz 1', 3, 'Ada', 'Lovelace'),
+            record('CS_101', 'Quiz 1', 1, 'Alan', 'Turing', 'incorrect'),
+            record('CS_101', 'Quiz 1', 3, 'Alan', 'Turing'),
+            record('CS_201', 'Quiz 1', 2, 'Grace', None),
+        ]
+        manifest = write_shards(data, self.folder)
+        with open(os.path.join(self.folder, SHARD_MANIFEST), encoding='utf-8') as f:
+            self.assertEqual(json.load(f), manifest)
+        self.assertEqual(manifest['total'], 4)
+
+        shards = self.shards_by_quiz(manifest)
+        cs101 = shards[('CS_101', 'Quiz 1')]
+        self.assertEqual(cs101['count'], 3)
+        self.assertEqual(cs101['question_numbers'], [1, 3])
+        self.assertEqual(cs101['users'], [['Ada', 'Lovelace'], ['Alan', 'Turing']])
+        self.assertEqual(cs101['statuses'], ['correct', 'incorrect'])
+        cs201 = shards[('CS_201', 'Quiz 1')]
+        self.assertEqual(cs201['question_numbers'], [2])
+        self.assertEqual(cs201['users'], [['Grace', None]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,6 +13,29 @@ import argparse
 import webbrowser
 import sys
 
+SHARD_PREFIX = "/_OUTPUT/shards/"
+SHARD_MANIFEST = SHARD_PREFIX + "manifest.json"
+
+
+class QuizRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """
+    Static file handler that lets browsers cache content-addressed library
+    shards forever while always revalidating the shard manifest. Only
+    successful responses are marked immutable, never errors such as a 404.
+    """
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
+    def end_headers(self):
+        path = self.path.split("?", 1)[0]
+        if path == SHARD_MANIFEST:
+            self.send_header("Cache-Control", "no-cache")
+        elif path.startswith(SHARD_PREFIX) and getattr(self, "_status", None) == 200:
+            self.send_header("Cache-Control", "public, max-age=31536000, immutable")
+        super().end_headers()
+
+
 def serve_quiz(directory: str = None, port: int = 8000, no_open: bool = False):
     """
     Serve the given directory over HTTP on localhost:<port>.
@@ -27,7 +50,7 @@ def serve_quiz(directory: str = None, port: int = 8000, no_open: bool = False):
     directory = directory or os.getcwd()
     os.chdir(directory)
 
-    handler = http.server.SimpleHTTPRequestHandler
+    handler = QuizRequestHandler
     with socketserver.TCPServer(("", port), handler) as httpd:
         url = f"http://localhost:{port}/index.html"
         print(f"Serving HTTP at {url}")